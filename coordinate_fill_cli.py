@@ -5,19 +5,24 @@ CLI for coordinate-based PDF form filling with real-time preview.
 
 import argparse
 import asyncio
-import json
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
-from formfill.coordinate_filler import CoordinateFiller
+from formfill.json_utils import loads
+
+# One "key: value" pair of the string format. Pairs are separated by ", "
+# only, so bare commas ("1,500") and further colons stay in the value
+_PAIR_RE = re.compile(r"((?:[^:,]|,(?! ))*):((?:[^,]|,(?! ))*)")
 
 
 def load_data_from_json(json_path: str) -> dict:
     """Load form data from JSON file."""
     try:
-        with open(json_path, 'r') as f:
-            data = json.load(f)
+        data = loads(Path(json_path).read_bytes())
         
         # Extract collected_answers if present
         if "collected_answers" in data:
@@ -30,18 +35,16 @@ def load_data_from_json(json_path: str) -> dict:
 
 def load_data_from_string(data_string: str) -> dict:
     """Parse form data from string format."""
-    data = {}
-    pairs = data_string.split(', ')
-    
-    for pair in pairs:
-        if ':' in pair:
-            key, value = pair.split(':', 1)
-            data[key.strip()] = value.strip()
-    
-    return data
+    if not data_string or ':' not in data_string:
+        return {}
+    return {
+        key.strip(): value.strip() for key, value in _PAIR_RE.findall(data_string)
+    }
 
 
-async def main():
+@lru_cache(maxsize=None)
+def _build_parser():
+    """Build the argument parser once and reuse it for later calls."""
     parser = argparse.ArgumentParser(
         description="Coordinate-based PDF form filler with real-time preview",
         epilog="""
@@ -77,14 +80,25 @@ Examples:
     # Interactive options
     parser.add_argument('--interactive', action='store_true', help='Interactive mode for adjusting placements')
     parser.add_argument('--show-confidence', action='store_true', help='Show confidence scores')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore cached field analysis and re-analyze the form; the new result replaces the cached one')
     
-    args = parser.parse_args()
+    return parser
+
+
+def main(args=None):
+    """Run the CLI, parsing ``sys.argv`` unless an ``args`` namespace is given."""
+    if args is None:
+        args = _build_parser().parse_args()
     
     # Validate input file
-    if not Path(args.pdf_file).exists():
+    pdf_path = Path(args.pdf_file)
+    if not pdf_path.exists():
         print(f"Error: PDF file '{args.pdf_file}' not found")
         sys.exit(1)
     
+    stem = pdf_path.stem
+    preview_path = args.preview or f"{stem}_preview.png"
+    
     # Load data
     if args.json:
         print(f"📄 Loading data from {args.json}")
@@ -94,8 +108,7 @@ Examples:
         data = load_data_from_string(args.string)
     
     print(f"📋 Loaded {len(data)} data fields:")
-    for key, value in data.items():
-        print(f"  • {key}: {value}")
+    sys.stdout.write("".join(f"  • {key}: {value}\n" for key, value in data.items()))
     
     # Check API key
     api_key = os.getenv("ANTHROPIC_API_KEY")
@@ -104,14 +117,24 @@ Examples:
         print("   Please set your API key: export ANTHROPIC_API_KEY='your-key-here'")
         sys.exit(1)
     
+    # Deferred so --help and input errors don't pay for the PDF/Claude stack
+    from formfill.coordinate_filler import CoordinateFiller, aclose_shared_clients
+    
     # Initialize filler
     print("🚀 Initializing coordinate filler...")
-    filler = CoordinateFiller(api_key)
+    filler = CoordinateFiller(api_key, refresh_cache=args.no_cache)
+    
+    async def analyze():
+        try:
+            return await filler.analyze_form_fields(args.pdf_file, data)
+        finally:
+            # Close the API connections before asyncio.run() closes the loop
+            await aclose_shared_clients()
     
     # Analyze form
     print("🔍 Analyzing form fields with Claude...")
     try:
-        placements = await filler.analyze_form_fields(args.pdf_file, data)
+        placements = asyncio.run(analyze())
     except Exception as e:
         print(f"❌ Error analyzing form: {e}")
         sys.exit(1)
@@ -121,9 +144,13 @@ Examples:
         sys.exit(1)
     
     print(f"📍 Found {len(placements)} field placements:")
-    for i, p in enumerate(placements):
-        confidence_str = f" [confidence: {p.confidence:.2f}]" if args.show_confidence else ""
-        print(f"  {i+1:2d}. {p.field_name:20s}: '{p.text}' at ({p.x:3d}, {p.y:3d}){confidence_str}")
+    if args.show_confidence:
+        def fmt(i, p):
+            return f"  {i+1:2d}. {p.field_name:20s}: '{p.text}' at ({p.x:3d}, {p.y:3d}) [confidence: {p.confidence:.2f}]\n"
+    else:
+        def fmt(i, p):
+            return f"  {i+1:2d}. {p.field_name:20s}: '{p.text}' at ({p.x:3d}, {p.y:3d})\n"
+    sys.stdout.write("".join(fmt(i, p) for i, p in enumerate(placements)))
     
     # Interactive adjustment mode
     if args.interactive:
@@ -131,10 +158,46 @@ Examples:
         print("Commands:")
         print("  adjust <index> <x> <y> - Move placement")
         print("  remove <index>         - Remove placement")
-        print("  add <name> <text> <x> <y> - Add placement")
+        print("  add <name> <text> <x> <y> [page] - Add placement (page defaults to 1)")
         print("  preview                - Show current preview")
         print("  done                   - Finish and save")
         
+        # Edits are queued and applied together when the preview is rendered
+        pending_ops = []
+        
+        def queue_adjust(cmd_args):
+            idx, x, y = int(cmd_args[0]) - 1, int(cmd_args[1]), int(cmd_args[2])
+            pending_ops.append(("adjust", (idx, x, y)))
+            print(f"✅ Adjusted placement {idx + 1}")
+        
+        def queue_remove(cmd_args):
+            idx = int(cmd_args[0]) - 1
+            pending_ops.append(("remove", (idx,)))
+            print(f"✅ Removed placement {idx + 1}")
+        
+        def queue_add(cmd_args):
+            name, text, x, y = cmd_args[0], cmd_args[1], int(cmd_args[2]), int(cmd_args[3])
+            page = int(cmd_args[4]) if len(cmd_args) > 4 else 1
+            page_count = len(filler.page_images)
+            if not 1 <= page <= page_count:
+                raise ValueError(f"page must be between 1 and {page_count}")
+            pending_ops.append(("add", (name, text, x, y), {"page": page - 1}))
+            print(f"✅ Added placement: {name} on page {page}")
+        
+        def show_preview(cmd_args):
+            filler.apply_ops(pending_ops)
+            pending_ops.clear()
+            preview_paths = filler.save_preview(preview_path, not args.no_labels)
+            print(f"👁️  Preview saved: {', '.join(preview_paths)}")
+        
+        # command -> (minimum number of arguments, handler)
+        commands = {
+            "adjust": (3, queue_adjust),
+            "remove": (1, queue_remove),
+            "add": (4, queue_add),
+            "preview": (0, show_preview),
+        }
+        
         while True:
             try:
                 cmd = input("\n> ").strip().split()
@@ -142,51 +205,47 @@ Examples:
                     continue
                     
                 if cmd[0] == "done":
+                    filler.apply_ops(pending_ops)
                     break
-                elif cmd[0] == "adjust" and len(cmd) >= 4:
-                    idx, x, y = int(cmd[1]) - 1, int(cmd[2]), int(cmd[3])
-                    filler.adjust_placement(idx, x, y)
-                    print(f"✅ Adjusted placement {idx + 1}")
-                elif cmd[0] == "remove" and len(cmd) >= 2:
-                    idx = int(cmd[1]) - 1
-                    filler.remove_placement(idx)
-                    print(f"✅ Removed placement {idx + 1}")
-                elif cmd[0] == "add" and len(cmd) >= 5:
-                    name, text, x, y = cmd[1], cmd[2], int(cmd[3]), int(cmd[4])
-                    filler.add_placement(name, text, x, y)
-                    print(f"✅ Added placement: {name}")
-                elif cmd[0] == "preview":
-                    preview_path = args.preview or f"{Path(args.pdf_file).stem}_preview.png"
-                    filler.save_preview(preview_path, not args.no_labels)
-                    print(f"👁️  Preview saved: {preview_path}")
-                else:
+                
+                min_args, handler = commands.get(cmd[0], (0, None))
+                if handler is None or len(cmd) - 1 < min_args:
                     print("❌ Invalid command. Use: adjust/remove/add/preview/done")
+                else:
+                    handler(cmd[1:])
             except (ValueError, IndexError) as e:
                 print(f"❌ Error: {e}")
             except KeyboardInterrupt:
                 print("\n👋 Exiting...")
                 sys.exit(0)
     
-    # Generate preview
-    preview_path = args.preview or f"{Path(args.pdf_file).stem}_preview.png"
+    # Generate the preview and, unless preview-only mode, the filled PDF.
+    # Both only read the placements, so render them concurrently.
     print(f"🖼️  Creating preview: {preview_path}")
-    filler.save_preview(preview_path, not args.no_labels)
-    print(f"   ✅ Preview saved! Open '{preview_path}' to verify placements")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        preview_future = executor.submit(filler.save_preview, preview_path, not args.no_labels)
+        
+        if not args.preview_only:
+            output_path = args.output or f"{stem}_filled.pdf"
+            print(f"📄 Writing filled PDF: {output_path}")
+            pdf_future = executor.submit(filler.write_to_pdf, output_path)
+        
+        preview_paths = preview_future.result()
+        print(f"   ✅ Preview saved! Open {', '.join(map(repr, preview_paths))} to verify placements")
+        
+        if not args.preview_only:
+            try:
+                result_path = pdf_future.result()
+                print(f"   ✅ Filled PDF saved: {result_path}")
+            except Exception as e:
+                print(f"❌ Error writing PDF: {e}")
+                sys.exit(1)
     
-    # Generate filled PDF (unless preview-only mode)
-    if not args.preview_only:
-        output_path = args.output or f"{Path(args.pdf_file).stem}_filled.pdf"
-        print(f"📄 Writing filled PDF: {output_path}")
-        try:
-            result_path = filler.write_to_pdf(output_path)
-            print(f"   ✅ Filled PDF saved: {result_path}")
-        except Exception as e:
-            print(f"❌ Error writing PDF: {e}")
-            sys.exit(1)
+    filler.close()
     
     print("\n🎉 Process completed successfully!")
     print(f"📋 Summary:")
-    print(f"   • Fields processed: {len(placements)}")
+    print(f"   • Fields processed: {len(filler.active_placements)}")
     print(f"   • Preview: {preview_path}")
     if not args.preview_only:
         print(f"   • Filled PDF: {output_path}")
@@ -194,7 +253,7 @@ Examples:
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        main()
     except KeyboardInterrupt:
         print("\n👋 Operation cancelled by user")
         sys.exit(0)
\ No newline at end of file
@@ -7,41 +7,58 @@ import argparse
 import asyncio
 import json
 import os
-import subprocess
 import sys
+from functools import lru_cache
 from pathlib import Path
 
+import format_data
+
 
 def format_json_data(json_file):
-    """Format JSON data using the existing format_data.py script."""
+    """Format JSON data using the helpers from format_data.py."""
     try:
-        result = subprocess.run([
-            'python3', 'format_data.py', json_file, '--string'
-        ], capture_output=True, text=True, check=True)
-        return result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        print(f"Error formatting data: {e}")
+        data = format_data.load_json_data(json_file)
+        answers = format_data.extract_answers(data)
+    except SystemExit:
+        # format_data reports the problem itself before exiting
         return None
+    return format_data.format_as_string(answers)
 
 
 def run_coordinate_filler(pdf_file, json_file, preview_only=False, interactive=False):
-    """Run the coordinate-based filler."""
-    cmd = ['python3', 'coordinate_fill_cli.py', pdf_file, '-j', json_file]
-    
-    if preview_only:
-        cmd.append('--preview-only')
-    if interactive:
-        cmd.append('--interactive')
-    
+    """Run the coordinate-based filler in this process."""
+    from coordinate_fill_cli import main as coord_main
+
+    args = argparse.Namespace(
+        pdf_file=pdf_file,
+        json=json_file,
+        string=None,
+        output=None,
+        preview=None,
+        preview_only=preview_only,
+        no_labels=False,
+        interactive=interactive,
+        show_confidence=False,
+        no_cache=False,
+    )
+
+    # main() returns normally on success; it only exits early, with status 0
+    # when the user cancels, so any exit means no filled PDF was written
     try:
-        result = subprocess.run(cmd, check=True)
+        coord_main(args)
         return True
-    except subprocess.CalledProcessError as e:
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            print(f"Error running coordinate filler: exit status {e.code}")
+        return False
+    except Exception as e:
         print(f"Error running coordinate filler: {e}")
         return False
 
 
-def main():
+@lru_cache(maxsize=None)
+def _build_parser():
+    """Build the argument parser once and reuse it for later calls."""
     parser = argparse.ArgumentParser(
         description="Complete PDF form filling workflow",
         epilog="""
@@ -65,7 +82,11 @@ Examples:
     parser.add_argument('--method', choices=['coordinate', 'computer_use'], default='coordinate',
                        help='Filling method to use (default: coordinate)')
     
-    args = parser.parse_args()
+    return parser
+
+
+def main():
+    args = _build_parser().parse_args()
     
     # Validate files
     if not Path(args.pdf_file).exists():
@@ -114,16 +135,20 @@ Examples:
         
         # Run FormFill
         print("🔄 Running FormFill...")
+        from formfill.cli import main as ff_main
+
+        ff_args = argparse.Namespace(
+            form=args.pdf_file,
+            file=None,
+            string=formatted_data,
+            verbose=args.preview,  # Verbose mode for preview
+        )
         try:
-            cmd = ['python3', '-m', 'formfill.cli', args.pdf_file, '-s', formatted_data]
-            if args.preview:
-                cmd.append('-v')  # Verbose mode for preview
-                
-            subprocess.run(cmd, check=True)
+            asyncio.run(ff_main(ff_args))
             print("✅ Computer use filling completed successfully!")
             
-        except subprocess.CalledProcessError as e:
-            print(f"❌ FormFill failed: {e}")
+        except SystemExit as e:
+            print(f"❌ FormFill failed: exit status {e.code}")
             sys.exit(1)
     
     print("\n🎉 Workflow completed!")
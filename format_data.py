@@ -10,15 +10,18 @@ import json
 import csv
 import argparse
 import sys
+from functools import lru_cache
 from pathlib import Path
 
+from formfill.json_utils import loads
+
+_UNDERSCORE = str.maketrans("_", " ")
+
 
 def load_json_data(json_file_path):
     """Load JSON data from file."""
     try:
-        with open(json_file_path, 'r') as f:
-            data = json.load(f)
-        return data
+        return loads(Path(json_file_path).read_bytes())
     except FileNotFoundError:
         print(f"Error: File '{json_file_path}' not found.")
         sys.exit(1)
@@ -35,15 +38,15 @@ def extract_answers(data):
     return data["collected_answers"]
 
 
+@lru_cache(maxsize=1024)
+def _title(key):
+    """Turn an answer key like FIRST_NAME into a readable label."""
+    return key.translate(_UNDERSCORE).title()
+
+
 def format_as_string(answers):
     """Format answers as a comma-separated string for CLI usage."""
-    formatted_pairs = []
-    for key, value in answers.items():
-        # Clean up the key and value for better readability
-        clean_key = key.replace("_", " ").title()
-        formatted_pairs.append(f"{clean_key}: {value}")
-    
-    return ", ".join(formatted_pairs)
+    return ", ".join(f"{_title(key)}: {value}" for key, value in answers.items())
 
 
 def format_as_csv(answers, output_file):
@@ -55,9 +58,7 @@ def format_as_csv(answers, output_file):
         writer.writerow(['Field', 'Value'])
         
         # Write data
-        for key, value in answers.items():
-            clean_key = key.replace("_", " ").title()
-            writer.writerow([clean_key, value])
+        writer.writerows((_title(key), value) for key, value in answers.items())
     
     print(f"CSV file created: {output_file}")
 
@@ -122,8 +123,7 @@ def main():
         print("📋 EXTRACTED DATA:")
         print("-" * 40)
         for key, value in answers.items():
-            clean_key = key.replace("_", " ").title()
-            print(f"{clean_key:30}: {value}")
+            print(f"{_title(key):30}: {value}")
         
         # Show usage examples
         json_path = Path(args.json_file)
@@ -4,6 +4,7 @@ import argparse
 import asyncio
 import logging
 import os
+import tempfile
 from pathlib import Path
 from pdf2image import convert_from_path
 from PIL import Image
@@ -43,7 +44,7 @@ def images_to_pdf(images: list[Image.Image], output_path: str) -> None:
     )
 
 
-async def main():
+async def main(args=None):
     os.environ["HEIGHT"] = "768"
     os.environ["WIDTH"] = "1024"
     # Set up argument parser
@@ -54,7 +55,8 @@ async def main():
     group.add_argument('-s', '--string', help='Direct string input for form data')
     parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose debug logging')    
 
-    args = parser.parse_args()
+    if args is None:
+        args = parser.parse_args()
 
     setup_logging(args.verbose)
     
@@ -70,22 +72,29 @@ async def main():
             with open(args.file) as f:
                 data = f.read()
         
-        # Convert PDF to images
-        images = convert_from_path(args.form)
-        
-        # Process each page
-        processed_images = []
-        for img in images:
-            filled_img = await fill_form(img, data)
+        # Convert PDF to images, rendering pages in parallel into a temp
+        # folder so pages are loaded from disk instead of held in memory
+        with tempfile.TemporaryDirectory() as temp_dir:
+            images = convert_from_path(
+                args.form,
+                thread_count=max(1, (os.cpu_count() or 2) - 1),
+                output_folder=temp_dir,
+                fmt="png"
+            )
             
-            processed_images.append(filled_img)
-        
-        # Generate output filename
-        input_path = Path(args.form)
-        output_path = f"{input_path.stem}_filled.pdf"
-        
-        # Convert processed images back to PDF
-        images_to_pdf(processed_images, str(output_path))
+            # Process each page
+            processed_images = []
+            for img in images:
+                filled_img = await fill_form(img, data)
+                
+                processed_images.append(filled_img)
+            
+            # Generate output filename
+            input_path = Path(args.form)
+            output_path = f"{input_path.stem}_filled.pdf"
+            
+            # Convert processed images back to PDF while the page files exist
+            images_to_pdf(processed_images, str(output_path))
         
         print(f"Form successfully filled and saved as: {output_path}")
         
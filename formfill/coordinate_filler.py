@@ -7,8 +7,16 @@ then writes the text directly to the PDF at those coordinates.
 """
 
 import json
+import hashlib
+import importlib.util
 import logging
 import asyncio
+import os
+import re
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
@@ -16,16 +24,128 @@ from dataclasses import dataclass
 import cv2
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
-from pdf2image import convert_from_path
 import fitz  # PyMuPDF
+import httpx
 
-from anthropic import AsyncAnthropic
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
 from anthropic.types.beta import BetaMessageParam
 
+from .json_utils import loads
+
 logger = logging.getLogger("coordinate_filler")
 
+# The JSON array in Claude's reply, from the first '[' to the last ']'
+_JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+# Claude downsamples images whose longest edge exceeds this, so larger
+# renders only cost encode time, upload bytes and input tokens
+MAX_IMAGE_EDGE = 1568
+
+# Model used for field analysis
+ANALYSIS_MODEL = "claude-3-5-sonnet-20241022"
+
+# Bump when the analysis prompt changes, so cached replies to the old
+# prompt are not reused
+ANALYSIS_PROMPT_VERSION = 2
+
+# Pages sent to Claude per request. Each request has at most this many
+# images, far below the API's limit of 100, and its JSON reply stays
+# within ANALYSIS_MAX_TOKENS even on dense pages
+PAGES_PER_REQUEST = 4
+ANALYSIS_MAX_TOKENS = 8192
+
+# Where Claude's field analysis responses are cached between runs
+DEFAULT_CACHE_DIR = "~/.cache/formfill"
+
+# Preview fonts, tried in order: macOS, Linux, Windows
+PREVIEW_FONT_PATHS = (
+    "/System/Library/Fonts/Arial.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "C:\\Windows\\Fonts\\arial.ttf",
+)
+
+# Semantic fallbacks for matching form fields to data, in priority order:
+# group -> (words in the field name, words to look for in the data keys)
+SEMANTIC_FIELD_GROUPS = {
+    'name': (frozenset({'name', 'first', 'last', 'full'}), ('name',)),
+    'email': (frozenset({'email', 'mail'}), ('email',)),
+    'phone': (frozenset({'phone', 'tel', 'number'}), ('phone',)),
+    'date': (frozenset({'date', 'birth', 'dob'}), ('birth', 'date')),
+    'address': (frozenset({'address', 'street', 'addr'}), ('address',)),
+}
+
+# Field-name word -> semantic group, plus one regex that finds every such
+# word in a field name (the lookahead also catches overlapping words)
+_FIELD_WORD_GROUPS = {
+    word: group for group, (words, _) in SEMANTIC_FIELD_GROUPS.items() for word in words
+}
+_FIELD_WORDS_RE = re.compile("(?=(%s))" % "|".join(sorted(_FIELD_WORD_GROUPS)))
+
+# Preview box colors (RGB) for high (>0.8), medium (>0.5) and low confidence
+CONFIDENCE_COLORS = (
+    (0, 255, 0),    # Green
+    (255, 255, 0),  # Yellow
+    (255, 0, 0),    # Red
+)
 
-@dataclass
+# Opacity of the filled preview boxes
+BOX_OPACITY = 0.5
+
+# PyMuPDF is not thread-safe, so all fitz work run off the event loop goes
+# through this one worker thread, even across fillers and event loops
+_FITZ_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="formfill-fitz")
+
+# API clients shared by event loop and API key, so every filler on a loop
+# reuses the same pooled TLS connections instead of handshaking per upload
+_SHARED_CLIENTS: Dict[asyncio.AbstractEventLoop, Dict[str, AsyncAnthropic]] = {}
+
+# HTTP/2 lets concurrent requests share one connection; httpx needs h2 for it
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _new_client(api_key: str) -> AsyncAnthropic:
+    """Create an AsyncAnthropic client whose requests reuse pooled TLS connections."""
+    return AsyncAnthropic(
+        api_key=api_key,
+        http_client=DefaultAsyncHttpxClient(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        ),
+    )
+
+
+def _shared_client(api_key: str) -> AsyncAnthropic:
+    """Return the client shared by all fillers on the running event loop."""
+    loop = asyncio.get_running_loop()
+    clients = _SHARED_CLIENTS.get(loop)
+    if clients is None:
+        # Forget loops that ended without aclose_shared_clients(); their
+        # connections can't be used again, and dropping them frees the sockets
+        for closed in [other for other in _SHARED_CLIENTS if other.is_closed()]:
+            del _SHARED_CLIENTS[closed]
+        clients = _SHARED_CLIENTS[loop] = {}
+    client = clients.get(api_key)
+    if client is None:
+        client = clients[api_key] = _new_client(api_key)
+    return client
+
+
+async def aclose_shared_clients():
+    """
+    Close the API clients shared on the running event loop.
+    
+    Call this before the loop ends, e.g. when a server shuts down. Later
+    analyses on the loop open new clients.
+    """
+    clients = _SHARED_CLIENTS.pop(asyncio.get_running_loop(), {})
+    await asyncio.gather(*(client.close() for client in clients.values()))
+
+
+# Slotted dataclasses need Python 3.10+
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class TextPlacement:
     """Represents a text placement on the PDF."""
     field_name: str
@@ -36,16 +156,39 @@ class TextPlacement:
     height: int = 20
     font_size: int = 12
     confidence: float = 0.0
+    page: int = 0  # Zero-based page index
 
 
 class CoordinateFiller:
     """Handles coordinate-based PDF form filling with real-time preview."""
     
-    def __init__(self, api_key: str):
-        self.client = AsyncAnthropic(api_key=api_key)
-        self.placements: List[TextPlacement] = []
+    # Preview fonts by size, shared by all instances
+    _FONT_CACHE: Dict[int, ImageFont.ImageFont] = {}
+    
+    def __init__(self, api_key: str, render_dpi: int = 100,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR, refresh_cache: bool = False):
+        self.api_key = api_key
+        # Client assigned to this filler; None uses the loop's shared client
+        self._client: Optional[AsyncAnthropic] = None
+        self.render_dpi = render_dpi
+        # Response cache directory; None disables caching. With refresh_cache
+        # cached responses are not read, but fresh ones still replace them
+        self._cache_dir = Path(cache_dir).expanduser() if cache_dir else None
+        self._refresh_cache = refresh_cache
+        # Removed placements are left as None so the indices shown to the
+        # user stay valid; the list is replaced by the next analysis
+        self.placements: List[Optional[TextPlacement]] = []
+        # Rendered pages; current_image is the first one
+        self.page_images: List[Image.Image] = []
         self.current_image: Optional[Image.Image] = None
         self.pdf_path: Optional[str] = None
+        # Open document for pdf_path, shared by rendering and write_to_pdf
+        self._doc: Optional[fitz.Document] = None
+        # Rendered previews by (show_labels, page), each with the placement
+        # state it was drawn from
+        self._previews: Dict[Tuple[bool, int], Tuple[tuple, Image.Image]] = {}
+        # PDF points per image pixel, per page
+        self._scales: List[float] = []
         
     async def analyze_form_fields(self, pdf_path: str, data: Dict[str, str]) -> List[TextPlacement]:
         """
@@ -58,38 +201,176 @@ class CoordinateFiller:
         Returns:
             List of TextPlacement objects
         """
-        self.pdf_path = pdf_path
+        # Rendering and hashing the PDF are blocking, so run them on worker
+        # threads alongside each other instead of on the event loop
+        loop = asyncio.get_running_loop()
+        _, cache_file = await asyncio.gather(
+            loop.run_in_executor(_FITZ_EXECUTOR, self._load_pdf, pdf_path),
+            loop.run_in_executor(None, self._cache_file, pdf_path, data),
+        )
         
-        # Convert PDF to image
-        images = convert_from_path(pdf_path, dpi=150)
-        if not images:
-            raise ValueError("Could not convert PDF to images")
+        # Reuse Claude's answer from an earlier run on the same PDF and data
+        placements = None
+        if not self._refresh_cache:
+            response_text = self._read_cached_response(cache_file)
+            if response_text is not None:
+                placements = self._parse_placements(response_text, data)
+                if placements is None:
+                    # E.g. truncated by a killed run; ask again and replace it
+                    logger.warning(f"Ignoring unreadable cached field analysis: {cache_file}")
+                else:
+                    logger.info(f"Using cached field analysis: {cache_file}")
+        
+        if placements is None:
+            response_text, complete = await self._request_field_analysis(data)
+            logger.info(f"Claude's field analysis: {response_text}")
+            placements = self._parse_placements(response_text, data)
+            if placements is None:
+                return []
+            if placements:
+                if complete:
+                    self._write_cached_response(cache_file, response_text)
+                else:
+                    # Replaying it would silently leave the missing pages empty
+                    logger.warning("Field analysis is incomplete and was not cached")
+        
+        self.placements = placements
+        self._previews.clear()
+        return placements
+    
+    def _parse_placements(self, response_text: str,
+                          data: Dict[str, str]) -> Optional[List[TextPlacement]]:
+        """Turn Claude's response into placements, or None if it can't be parsed."""
+        # Extract JSON from response
+        try:
+            # Find JSON array in response
+            match = _JSON_ARRAY_RE.search(response_text)
+            if match is None:
+                raise ValueError("No JSON array found in response")
+                
+            field_data = loads(match.group(0))
+            
+            # Lowercase the data keys and resolve the semantic fallbacks once
+            lowered = [(key.lower(), value) for key, value in data.items()]
+            semantic_index = self._build_semantic_index(lowered)
+            
+            # Convert to TextPlacement objects
+            placements = []
+            for field in field_data:
+                # Find matching data
+                suggested_data = field.get('suggested_data', '')
+                actual_data = self._match_data_to_field(
+                    field['field_name'], lowered, semantic_index, suggested_data
+                )
+                
+                try:
+                    page = int(field.get('page', 1)) - 1
+                except (TypeError, ValueError):  # E.g. "page": null
+                    page = -1
+                if not 0 <= page < len(self.page_images):
+                    logger.warning(f"Skipping field on unknown page: {field}")
+                    continue
+                
+                placement = TextPlacement(
+                    field_name=field['field_name'],
+                    text=actual_data,
+                    x=field['x'],
+                    y=field['y'],
+                    width=field.get('width', 200),
+                    height=field.get('height', 25),
+                    confidence=field.get('confidence', 0.5),
+                    page=page
+                )
+                placements.append(placement)
+            return placements
             
-        self.current_image = images[0]  # For now, handle first page only
+        except (json.JSONDecodeError, KeyError, ValueError) as e:
+            logger.error(f"Failed to parse Claude's response: {e}")
+            logger.error(f"Response was: {response_text}")
+            return None
+    
+    async def _request_field_analysis(self, data: Dict[str, str]) -> Tuple[str, bool]:
+        """
+        Ask Claude where each piece of data goes.
+        
+        Pages are sent in batches of PAGES_PER_REQUEST, all requested
+        concurrently. With more than one batch, the fields from every
+        reply are merged into a single JSON array.
+        
+        Returns:
+            The response text, and whether it is complete: no reply was cut
+            off at max_tokens and, when merging, every reply parsed
+        """
+        # Encode the pages in parallel; Pillow releases the GIL while encoding
+        loop = asyncio.get_running_loop()
+        encoded_pages = await asyncio.gather(*(
+            loop.run_in_executor(None, self._image_to_base64, image)
+            for image in self.page_images
+        ))
+        
+        page_count = len(encoded_pages)
+        batches = [
+            range(start, min(start + PAGES_PER_REQUEST, page_count))
+            for start in range(0, page_count, PAGES_PER_REQUEST)
+        ]
+        results = await asyncio.gather(*(
+            self._request_page_batch(data, encoded_pages, pages) for pages in batches
+        ))
+        if len(results) == 1:
+            return results[0]
         
+        fields = []
+        complete = True
+        for pages, (reply, reply_complete) in zip(batches, results):
+            complete = complete and reply_complete
+            match = _JSON_ARRAY_RE.search(reply)
+            try:
+                if match is None:
+                    raise ValueError("No JSON array found in response")
+                fields.extend(loads(match.group(0)))
+            except (TypeError, ValueError) as e:
+                complete = False
+                logger.error(f"Failed to parse Claude's response for pages "
+                             f"{pages.start + 1}-{pages.stop}: {e}")
+        return json.dumps(fields), complete
+    
+    async def _request_page_batch(self, data: Dict[str, str], encoded_pages: List[str],
+                                  pages: range) -> Tuple[str, bool]:
+        """
+        Ask Claude for the fields on one batch of pages.
+        
+        Returns:
+            The response text, and False if it was cut off at max_tokens
+        """
         # Prepare data string for Claude
         data_str = ", ".join([f"{k}: {v}" for k, v in data.items()])
         
         # Ask Claude to identify form fields and their coordinates
-        messages = [
+        if len(pages) == len(encoded_pages):
+            pages_str = f"The form has {len(pages)} page(s)."
+        else:
+            pages_str = (f"These are pages {pages.start + 1} to {pages.stop} "
+                         f"of a {len(encoded_pages)}-page form.")
+        content = [
             {
-                "role": "user", 
-                "content": [
-                    {
-                        "type": "text",
-                        "text": f"""I need to fill out this PDF form with the following data: {data_str}
+                "type": "text",
+                "text": f"""I need to fill out this PDF form with the following data: {data_str}
 
-Please analyze this form image and identify where each piece of data should be placed. For each form field you can identify, please provide:
+{pages_str} Each page image follows below, preceded by its page number.
+
+Please analyze the form images and identify where each piece of data should be placed. For each form field you can identify, please provide:
 
 1. The field name/label you see
-2. The approximate coordinates (x, y) where text should be placed
-3. The estimated width and height of the field
-4. Which piece of my data should go in that field
+2. The page number the field is on
+3. The approximate coordinates (x, y) where text should be placed, in that page image's pixels
+4. The estimated width and height of the field
+5. Which piece of my data should go in that field
 
 Please format your response as a JSON array like this:
 [
   {{
     "field_name": "First Name",
+    "page": {pages.start + 1},
     "suggested_data": "John",
     "x": 150,
     "y": 200,
@@ -100,164 +381,209 @@ Please format your response as a JSON array like this:
 ]
 
 Focus on identifying clear, fillable form fields. Be precise with coordinates."""
-                    },
-                    {
-                        "type": "image",
-                        "source": {
-                            "type": "base64",
-                            "media_type": "image/png",
-                            "data": self._image_to_base64(self.current_image)
-                        }
-                    }
-                ]
             }
         ]
         
+        for index in pages:
+            content.append({"type": "text", "text": f"Page {index + 1}:"})
+            content.append({
+                "type": "image",
+                "source": {
+                    "type": "base64",
+                    "media_type": "image/jpeg",
+                    "data": encoded_pages[index]
+                }
+            })
+        messages = [{"role": "user", "content": content}]
+        
         response = await self.client.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=2000,
+            model=ANALYSIS_MODEL,
+            max_tokens=ANALYSIS_MAX_TOKENS,
             messages=messages
         )
+        complete = response.stop_reason != "max_tokens"
+        if not complete:
+            logger.warning(f"Claude's response for pages {pages.start + 1}-{pages.stop} "
+                           f"hit the {ANALYSIS_MAX_TOKENS} token limit and is incomplete")
         
-        # Parse Claude's response
-        response_text = response.content[0].text
-        logger.info(f"Claude's field analysis: {response_text}")
+        return response.content[0].text, complete
+    
+    def close(self):
+        """Close the PDF document kept open between analysis and writing."""
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+    
+    @property
+    def client(self) -> AsyncAnthropic:
+        """The client assigned to this filler, else the one shared on the running loop."""
+        if self._client is not None:
+            return self._client
+        return _shared_client(self.api_key)
+    
+    @client.setter
+    def client(self, client: Optional[AsyncAnthropic]):
+        self._client = client
+    
+    async def __aenter__(self) -> "CoordinateFiller":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _load_pdf(self, pdf_path: str):
+        """Render every page of the PDF as the images placements are made against."""
+        self.close()
+        self.pdf_path = pdf_path
+        self._doc = fitz.open(pdf_path)
+        if self._doc.page_count == 0:
+            raise ValueError("Could not convert PDF to images")
         
-        # Extract JSON from response
+        # Rasterize straight from PyMuPDF's pixel buffer
+        self.page_images = []
+        self._scales = []
+        for page in self._doc:
+            pix = page.get_pixmap(dpi=self.render_dpi, alpha=False)
+            image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+            image.thumbnail((MAX_IMAGE_EDGE, MAX_IMAGE_EDGE), Image.LANCZOS)
+            self.page_images.append(image)
+            self._scales.append(page.rect.width / image.width)
+        self.current_image = self.page_images[0]
+        self._previews.clear()
+    
+    def _cache_file(self, pdf_path: str, data: Dict[str, str]) -> Optional[Path]:
+        """Cache path for an analysis, keyed by PDF contents, request settings and data."""
+        if self._cache_dir is None:
+            return None
+        digest = hashlib.blake2b(Path(pdf_path).read_bytes(), digest_size=16)
+        digest.update(b"|%d|%d|%d|" % (self.render_dpi, MAX_IMAGE_EDGE, PAGES_PER_REQUEST))
+        digest.update(f"{ANALYSIS_MODEL}|{ANALYSIS_PROMPT_VERSION}|".encode())
+        digest.update(json.dumps(data, sort_keys=True).encode())
+        return self._cache_dir / f"{digest.hexdigest()}.txt"
+    
+    def _read_cached_response(self, cache_file: Optional[Path]) -> Optional[str]:
+        """Return a cached Claude response, or None on a miss."""
+        if cache_file is None:
+            return None
         try:
-            # Find JSON array in response
-            start_idx = response_text.find('[')
-            end_idx = response_text.rfind(']') + 1
-            if start_idx == -1 or end_idx == 0:
-                raise ValueError("No JSON array found in response")
-                
-            json_str = response_text[start_idx:end_idx]
-            field_data = json.loads(json_str)
-            
-            # Convert to TextPlacement objects
-            placements = []
-            for field in field_data:
-                # Find matching data
-                suggested_data = field.get('suggested_data', '')
-                actual_data = self._match_data_to_field(field['field_name'], data, suggested_data)
-                
-                placement = TextPlacement(
-                    field_name=field['field_name'],
-                    text=actual_data,
-                    x=field['x'],
-                    y=field['y'],
-                    width=field.get('width', 200),
-                    height=field.get('height', 25),
-                    confidence=field.get('confidence', 0.5)
-                )
-                placements.append(placement)
-                
-            self.placements = placements
-            return placements
-            
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
-            logger.error(f"Failed to parse Claude's response: {e}")
-            logger.error(f"Response was: {response_text}")
-            return []
+            return cache_file.read_text(encoding="utf-8")
+        except OSError:
+            return None
+    
+    def _write_cached_response(self, cache_file: Optional[Path], response_text: str):
+        """Store a Claude response for later runs; failures only cost a cache miss."""
+        if cache_file is None:
+            return
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # Write a temporary file and move it into place, so a killed or
+            # concurrent run never leaves a partly written entry
+            fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+                    tmp.write(response_text)
+                os.replace(tmp_path, cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Could not cache field analysis: {e}")
+    
+    def _build_semantic_index(self, lowered: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Resolve each semantic group to the first data value whose key fits it."""
+        index = []
+        for group, (_, key_words) in SEMANTIC_FIELD_GROUPS.items():
+            for key, value in lowered:
+                if any(word in key for word in key_words):
+                    index.append((group, value))
+                    break
+        return index
     
-    def _match_data_to_field(self, field_name: str, data: Dict[str, str], suggested: str) -> str:
+    def _match_data_to_field(self, field_name: str, lowered: List[Tuple[str, str]],
+                             semantic_index: List[Tuple[str, str]], suggested: str) -> str:
         """Match form field to appropriate data."""
         field_lower = field_name.lower()
         
         # Try exact match first
-        for key, value in data.items():
-            if key.lower() in field_lower or field_lower in key.lower():
+        for key, value in lowered:
+            if key in field_lower or field_lower in key:
                 return value
                 
         # Try semantic matching
-        name_fields = ['name', 'first', 'last', 'full']
-        email_fields = ['email', 'mail']
-        phone_fields = ['phone', 'tel', 'number']
-        address_fields = ['address', 'street', 'addr']
-        date_fields = ['date', 'birth', 'dob']
-        
-        for pattern in name_fields:
-            if pattern in field_lower:
-                for key, value in data.items():
-                    if 'name' in key.lower():
-                        return value
-                        
-        for pattern in email_fields:
-            if pattern in field_lower:
-                for key, value in data.items():
-                    if 'email' in key.lower():
-                        return value
-                        
-        for pattern in phone_fields:
-            if pattern in field_lower:
-                for key, value in data.items():
-                    if 'phone' in key.lower():
-                        return value
-                        
-        for pattern in address_fields:
-            if pattern in field_lower:
-                for key, value in data.items():
-                    if 'address' in key.lower():
-                        return value
-                        
-        for pattern in date_fields:
-            if pattern in field_lower:
-                for key, value in data.items():
-                    if 'birth' in key.lower() or 'date' in key.lower():
-                        return value
-        
-        # Return suggested data if no match found
-        return suggested
-    
-    def create_preview_image(self, show_labels: bool = True) -> Image.Image:
+        groups = {_FIELD_WORD_GROUPS[word] for word in _FIELD_WORDS_RE.findall(field_lower)}
+        if not groups:
+            return suggested
+        
+        # First group in priority order with data, else the suggested data
+        return next((value for group, value in semantic_index if group in groups), suggested)
+    
+    def create_preview_image(self, show_labels: bool = True, page: int = 0) -> Image.Image:
         """
         Create a preview image showing where text will be placed.
         
         Args:
             show_labels: Whether to show field labels
+            page: Zero-based index of the page to preview
             
         Returns:
             PIL Image with text placement overlay
         """
-        if not self.current_image or not self.placements:
-            return self.current_image or Image.new('RGB', (800, 600), 'white')
-            
-        # Create a copy of the original image
-        preview = self.current_image.copy()
-        draw = ImageDraw.Draw(preview)
+        # A copy, so callers can't alter the cached preview
+        return self._render_preview(show_labels, page).copy()
+    
+    def _render_preview(self, show_labels: bool, page: int) -> Image.Image:
+        """Draw a page preview, or return the cached one; callers must not modify it."""
+        if not self.page_images:
+            return Image.new('RGB', (800, 600), 'white')
+        page_image = self.page_images[page]
         
-        # Try to load a font
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 12)
-            label_font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 10)
-        except:
-            font = ImageFont.load_default()
-            label_font = ImageFont.load_default()
-        
-        # Draw placements
-        for i, placement in enumerate(self.placements):
-            # Draw bounding box
-            bbox = [
-                placement.x, placement.y,
-                placement.x + placement.width, placement.y + placement.height
-            ]
+        # Keep the global index so labels match the numbering used for edits
+        page_placements = [
+            (i, p) for i, p in enumerate(self.placements) if p is not None and p.page == page
+        ]
+        if not page_placements:
+            return page_image
+        
+        # Compare what the preview shows, so placements changed by any
+        # route, not only the *_placement methods, are redrawn
+        state = tuple(
+            (i, p.field_name, p.text, p.x, p.y, p.width, p.height, p.confidence)
+            for i, p in page_placements
+        )
+        cached = self._previews.get((show_labels, page))
+        if cached is not None and cached[0] == state:
+            return cached[1]
             
+        font = self._get_font(12)
+        label_font = self._get_font(10)
+        
+        # Draw the boxes with OpenCV on a NumPy copy of the page: fill them
+        # on an overlay, blend it in once, then add solid borders
+        boxes = []
+        for _, placement in page_placements:
             # Color based on confidence
             if placement.confidence > 0.8:
-                color = (0, 255, 0, 128)  # Green for high confidence
+                color = CONFIDENCE_COLORS[0]
             elif placement.confidence > 0.5:
-                color = (255, 255, 0, 128)  # Yellow for medium confidence
+                color = CONFIDENCE_COLORS[1]
             else:
-                color = (255, 0, 0, 128)  # Red for low confidence
-            
-            # Draw semi-transparent rectangle
-            overlay = Image.new('RGBA', preview.size, (255, 255, 255, 0))
-            overlay_draw = ImageDraw.Draw(overlay)
-            overlay_draw.rectangle(bbox, fill=color, outline=color[:3], width=2)
-            preview = Image.alpha_composite(preview.convert('RGBA'), overlay).convert('RGB')
-            
+                color = CONFIDENCE_COLORS[2]
+            x0, y0 = int(placement.x), int(placement.y)
+            boxes.append(((x0, y0), (x0 + int(placement.width), y0 + int(placement.height)), color))
+        
+        canvas = np.array(page_image.convert('RGB'))
+        overlay = canvas.copy()
+        for top_left, bottom_right, color in boxes:
+            cv2.rectangle(overlay, top_left, bottom_right, color, thickness=-1)
+        cv2.addWeighted(overlay, BOX_OPACITY, canvas, 1 - BOX_OPACITY, 0, dst=canvas)
+        for top_left, bottom_right, color in boxes:
+            cv2.rectangle(canvas, top_left, bottom_right, color, thickness=2)
+        preview = Image.fromarray(canvas)
+        
+        # Draw text and labels on top of the boxes
+        draw = ImageDraw.Draw(preview)
+        for i, placement in page_placements:
             # Draw text that will be placed
-            draw = ImageDraw.Draw(preview)
             text_x = placement.x + 2
             text_y = placement.y + 2
             draw.text((text_x, text_y), placement.text, fill=(0, 0, 0), font=font)
@@ -268,13 +594,55 @@ Focus on identifying clear, fillable form fields. Be precise with coordinates.""
                 label_y = placement.y - 15 if placement.y > 15 else placement.y + placement.height + 2
                 draw.text((placement.x, label_y), label_text, fill=(0, 0, 255), font=label_font)
         
+        self._previews[(show_labels, page)] = (state, preview)
         return preview
     
-    def save_preview(self, output_path: str, show_labels: bool = True):
-        """Save preview image to file."""
-        preview = self.create_preview_image(show_labels)
-        preview.save(output_path)
-        logger.info(f"Preview saved to {output_path}")
+    @property
+    def active_placements(self) -> List[TextPlacement]:
+        """Placements that have not been removed."""
+        return [p for p in self.placements if p is not None]
+    
+    def _get_font(self, size: int) -> ImageFont.ImageFont:
+        """Load a preview font once per size, falling back to PIL's default."""
+        font = self._FONT_CACHE.get(size)
+        if font is None:
+            for path in PREVIEW_FONT_PATHS:
+                try:
+                    font = ImageFont.truetype(path, size)
+                    break
+                except OSError:
+                    continue
+            else:
+                font = ImageFont.load_default()
+            self._FONT_CACHE[size] = font
+        return font
+    
+    def save_preview(self, output_path: str, show_labels: bool = True) -> List[str]:
+        """
+        Save preview images to file.
+        
+        The first page is saved to output_path; further pages get a
+        "_page<N>" suffix, e.g. preview_page2.png.
+        
+        Returns:
+            Paths of the saved preview images
+        """
+        output = Path(output_path)
+        paths = []
+        for page in range(max(len(self.page_images), 1)):
+            if page == 0:
+                path = output_path
+            else:
+                path = str(output.with_name(f"{output.stem}_page{page + 1}{output.suffix}"))
+            preview = self._render_preview(show_labels, page)
+            if Path(path).suffix.lower() == ".png":
+                # Fast zlib level: previews are throwaway files
+                preview.save(path, format="PNG", compress_level=1)
+            else:
+                preview.convert("RGB").save(path)
+            paths.append(path)
+            logger.info(f"Preview saved to {path}")
+        return paths
     
     def write_to_pdf(self, output_path: str) -> str:
         """
@@ -286,46 +654,84 @@ Focus on identifying clear, fillable form fields. Be precise with coordinates.""
         Returns:
             Path to the created PDF
         """
-        if not self.pdf_path or not self.placements:
+        placements = self.active_placements
+        if not self.pdf_path or not placements:
             raise ValueError("No PDF or placements available")
             
-        # Open PDF with PyMuPDF
-        doc = fitz.open(self.pdf_path)
-        page = doc[0]  # First page only for now
+        if Path(output_path).resolve() == Path(self.pdf_path).resolve():
+            # Filling in place: reuse the document opened for rendering. It
+            # now holds the filled text, so it can't be used for rendering
+            doc = self._doc if self._doc is not None else fitz.open(self.pdf_path)
+            self._doc = None
+        else:
+            # Append the text to a copy of the original instead of
+            # rewriting every object of the PDF into the output file
+            shutil.copyfile(self.pdf_path, output_path)
+            doc = fitz.open(output_path)
         
-        for placement in self.placements:
-            # Convert coordinates (PIL uses different coordinate system)
-            point = fitz.Point(placement.x, placement.y + placement.font_size)
+        # Collect each page's text into one TextWriter so the page content
+        # stream is extended once rather than once per placement
+        font = fitz.Font("helv")
+        writers: Dict[int, fitz.TextWriter] = {}
+        for placement in placements:
+            writer = writers.get(placement.page)
+            if writer is None:
+                writer = fitz.TextWriter(doc[placement.page].rect, color=(0, 0, 0))  # Black text
+                writers[placement.page] = writer
+            scale = self._scales[placement.page]
             
-            # Insert text
-            page.insert_text(
-                point,
-                placement.text,
-                fontsize=placement.font_size,
-                color=(0, 0, 0)  # Black text
+            # Placements are in image pixels; map them back to PDF points
+            point = fitz.Point(
+                placement.x * scale,
+                placement.y * scale + placement.font_size
             )
+            writer.append(point, placement.text, font=font, fontsize=placement.font_size)
+        
+        for page_index, writer in writers.items():
+            writer.write_text(doc[page_index])
         
-        # Save the modified PDF
-        doc.save(output_path)
-        doc.close()
+        # Save only the changes as an incremental update. saveIncr() writes
+        # to the file the document was opened from, which is output_path
+        # even when it is spelled differently, e.g. "./form.pdf"
+        if doc.can_save_incrementally():
+            doc.saveIncr()
+            doc.close()
+        else:
+            # E.g. the file needed repairs when opened; rewrite it in full
+            filled = doc.tobytes(garbage=3, deflate=True)
+            doc.close()
+            Path(output_path).write_bytes(filled)
         
         logger.info(f"Filled PDF saved to {output_path}")
         return output_path
     
+    async def save_preview_async(self, output_path: str, show_labels: bool = True) -> List[str]:
+        """Save preview images in a worker thread, keeping the event loop free."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.save_preview, output_path, show_labels)
+    
+    async def write_to_pdf_async(self, output_path: str) -> str:
+        """Write the filled PDF in a worker thread, keeping the event loop free."""
+        loop = asyncio.get_running_loop()
+        # Same thread as PDF rendering, since PyMuPDF is not thread-safe
+        return await loop.run_in_executor(_FITZ_EXECUTOR, self.write_to_pdf, output_path)
+    
     def _image_to_base64(self, image: Image.Image) -> str:
-        """Convert PIL Image to base64 string."""
+        """Convert PIL Image to a base64 JPEG string, sent as image/jpeg."""
         import base64
         import io
         
         buffer = io.BytesIO()
-        image.save(buffer, format='PNG')
-        img_bytes = buffer.getvalue()
-        return base64.b64encode(img_bytes).decode('utf-8')
+        # Much smaller and faster to encode than PNG, and just as readable
+        # for locating form fields
+        image.convert("RGB").save(buffer, format="JPEG", quality=85)
+        # Encode straight from the buffer's memory instead of a getvalue() copy
+        return base64.b64encode(buffer.getbuffer()).decode("ascii")
     
     def adjust_placement(self, index: int, x: int = None, y: int = None, 
                         width: int = None, height: int = None):
         """Manually adjust a text placement."""
-        if 0 <= index < len(self.placements):
+        if 0 <= index < len(self.placements) and self.placements[index] is not None:
             placement = self.placements[index]
             if x is not None:
                 placement.x = x
@@ -338,13 +744,19 @@ Focus on identifying clear, fillable form fields. Be precise with coordinates.""
             logger.info(f"Adjusted placement {index}: {placement.field_name}")
     
     def remove_placement(self, index: int):
-        """Remove a text placement."""
-        if 0 <= index < len(self.placements):
-            removed = self.placements.pop(index)
+        """
+        Remove a text placement.
+        
+        The slot is cleared rather than popped, so the indices of later
+        placements stay valid for the rest of the session.
+        """
+        if 0 <= index < len(self.placements) and self.placements[index] is not None:
+            removed = self.placements[index]
+            self.placements[index] = None
             logger.info(f"Removed placement: {removed.field_name}")
     
     def add_placement(self, field_name: str, text: str, x: int, y: int, 
-                     width: int = 200, height: int = 25):
+                     width: int = 200, height: int = 25, page: int = 0):
         """Manually add a text placement."""
         placement = TextPlacement(
             field_name=field_name,
@@ -353,10 +765,28 @@ Focus on identifying clear, fillable form fields. Be precise with coordinates.""
             y=y,
             width=width,
             height=height,
-            confidence=1.0  # Manual placements have full confidence
+            confidence=1.0,  # Manual placements have full confidence
+            page=page
         )
         self.placements.append(placement)
         logger.info(f"Added placement: {field_name} at ({x}, {y})")
+    
+    def apply_ops(self, ops: List[tuple]):
+        """
+        Apply a batch of queued placement edits in order.
+        
+        Args:
+            ops: (operation, args) or (operation, args, kwargs) tuples, where
+                operation is "adjust", "remove" or "add" and args and kwargs
+                are passed to the matching *_placement method
+        """
+        handlers = {
+            "adjust": self.adjust_placement,
+            "remove": self.remove_placement,
+            "add": self.add_placement,
+        }
+        for op, op_args, *op_kwargs in ops:
+            handlers[op](*op_args, **(op_kwargs[0] if op_kwargs else {}))
 
 
 async def main():
@@ -378,30 +808,32 @@ async def main():
         print("Error: ANTHROPIC_API_KEY environment variable not set")
         return
         
-    filler = CoordinateFiller(api_key)
-    
     # Analyze form
     pdf_path = "examples/sample_form.pdf"
     if not Path(pdf_path).exists():
         print(f"Error: {pdf_path} not found")
         return
         
-    print("🔍 Analyzing form fields...")
-    placements = await filler.analyze_form_fields(pdf_path, sample_data)
-    
-    print(f"📍 Found {len(placements)} field placements:")
-    for i, p in enumerate(placements):
-        print(f"  {i+1}. {p.field_name}: '{p.text}' at ({p.x}, {p.y}) [confidence: {p.confidence:.2f}]")
-    
-    # Create preview
-    print("🖼️  Creating preview...")
-    filler.save_preview("form_preview.png")
-    print("   Preview saved as 'form_preview.png'")
+    async with CoordinateFiller(api_key) as filler:
+        print("🔍 Analyzing form fields...")
+        placements = await filler.analyze_form_fields(pdf_path, sample_data)
+        
+        print(f"📍 Found {len(placements)} field placements:")
+        for i, p in enumerate(placements):
+            print(f"  {i+1}. {p.field_name}: '{p.text}' at ({p.x}, {p.y}) [confidence: {p.confidence:.2f}]")
+        
+        # Create preview
+        print("🖼️  Creating preview...")
+        await filler.save_preview_async("form_preview.png")
+        print("   Preview saved as 'form_preview.png'")
+        
+        # Write to PDF
+        print("📄 Writing to PDF...")
+        output_pdf = await filler.write_to_pdf_async("sample_form_filled.pdf")
+        print(f"   Filled PDF saved as '{output_pdf}'")
     
-    # Write to PDF
-    print("📄 Writing to PDF...")
-    output_pdf = filler.write_to_pdf("sample_form_filled.pdf")
-    print(f"   Filled PDF saved as '{output_pdf}'")
+    # The example is the whole program, so close the shared API connections
+    await aclose_shared_clients()
 
 
 if __name__ == "__main__":
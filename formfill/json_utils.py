@@ -0,0 +1,6 @@
+"""JSON parsing shared by the FormFill modules and scripts."""
+
+try:
+    from orjson import loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    from json import loads